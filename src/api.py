@@ -0,0 +1,289 @@
+# api.py
+#
+# Servicio HTTP de solo lectura sobre los mismos datos DuckDB que report.py.
+# Pensado para consumidores batch: aplica los mismos filtros que el reporte y
+# devuelve Arrow IPC, Parquet o CSV en streaming, sin pasar por Streamlit ni pandas.
+#
+# Uso:
+#   python src/api.py --port 8502
+#   curl "http://localhost:8502/rows?product=ABC&format=arrow" -o rows.arrow
+#
+# Parámetros de /rows:
+#   license    Licencia contiene… (case-insensitive, requiere CSV de licencias)
+#   product    Producto contiene… (case-insensitive)
+#   shelflife  Shelf life contiene…
+#   format     arrow (default) | parquet | csv
+#   limit      filas por página (default 100000, máximo 500000; mayor → 400)
+#   offset     desplazamiento de la página (default 0)
+#
+# Una página con menos de `limit` filas es la última. Un filtro sobre una
+# columna no disponible (p. ej. license sin CSV de licencias) devuelve 400.
+# El cuerpo va con Transfer-Encoding: chunked; si la consulta falla a mitad
+# del streaming, la respuesta se corta sin el chunk final y el cliente HTTP
+# lo detecta como respuesta incompleta.
+
+import argparse
+import json
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import duckdb
+import pyarrow.csv as pacsv
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from rim_views import build_where, create_views
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+PARQUET_DIR_CANDIDATES = [
+    BASE_DIR / "data" / "processed" / "rim_license_product_filtered" / "parquet_selected_cols",
+    BASE_DIR / "src" / "data" / "processed" / "rim_license_product_filtered" / "parquet_selected_cols",
+]
+LICENSE_CSV_CANDIDATES = [
+    BASE_DIR / "data" / "raw" / "rim_license_392.csv",
+    BASE_DIR / "src" / "data" / "raw" / "rim_license_392.csv",
+]
+
+VIEW_NAME = "rim"
+OUTPUT_COLUMNS = ["licensenumber", "licenseid", "localproductcode", "approvedshelflife"]
+ORDER_COLUMN = "licenseproductid"
+
+DEFAULT_LIMIT = 100_000
+MAX_LIMIT = 500_000  # mismo tope que la exportación del reporte
+BATCH_SIZE = 50_000
+
+CONTENT_TYPES = {
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def find_parquet():
+    """Misma búsqueda que el sidebar de report.py: rim_filtered.parquet o el primero."""
+    for d in PARQUET_DIR_CANDIDATES:
+        if d.exists() and d.is_dir():
+            preferred = d / "rim_filtered.parquet"
+            if preferred.exists():
+                return preferred
+            parquet_files = sorted(d.glob("*.parquet"))
+            if parquet_files:
+                return parquet_files[0]
+    return None
+
+
+def find_license_csv():
+    for path in LICENSE_CSV_CANDIDATES:
+        if path.exists():
+            return path
+    return None
+
+
+def open_connection(parquet_path, license_csv=None):
+    """Crea la conexión DuckDB y las vistas rim_base / license_map / rim.
+
+    Parquet viene incluido en duckdb: no se hace INSTALL (requeriría red).
+    """
+    con = duckdb.connect()
+    con.execute("PRAGMA threads=8;")
+    create_views(con, parquet_path, license_csv, view_name=VIEW_NAME)
+    return con
+
+
+def build_query(present_cols, query):
+    """Traduce los parámetros de la URL al mismo WHERE que usa report.py.
+
+    Lanza ValueError (→ 400) ante parámetros inválidos, en vez de ignorarlos.
+    """
+    values = {name: query.get(name, [""])[0] for name in ("license", "product", "shelflife")}
+    where_sql, params = build_where(present_cols, values, strict=True)
+
+    limit = _int_param(query, "limit", DEFAULT_LIMIT)
+    offset = _int_param(query, "offset", 0)
+    if limit < 1 or offset < 0:
+        raise ValueError("limit debe ser >= 1 y offset >= 0")
+    if limit > MAX_LIMIT:
+        raise ValueError(f"limit máximo: {MAX_LIMIT}")
+
+    # Orden estable para que la paginación por offset sea consistente;
+    # sin la columna de orden no se puede paginar.
+    if ORDER_COLUMN in present_cols:
+        order_sql = f" ORDER BY {ORDER_COLUMN}"
+    elif offset > 0:
+        raise ValueError(f"paginación no disponible: falta la columna {ORDER_COLUMN}")
+    else:
+        order_sql = ""
+
+    cols = [c for c in OUTPUT_COLUMNS if c in present_cols]
+    sql = f"SELECT {','.join(cols)} FROM {VIEW_NAME}{where_sql}{order_sql} LIMIT {limit} OFFSET {offset}"
+    return sql, params, limit, offset
+
+
+def _int_param(query, name, default):
+    raw = query.get(name, [""])[0]
+    if not raw.strip():
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        raise ValueError(f"'{name}' debe ser un entero")
+
+
+class _ChunkedSink:
+    """Adaptador de wfile para los writers de pyarrow con Transfer-Encoding: chunked.
+
+    El chunk final solo se envía con finish(): una respuesta cortada por un
+    error queda incompleta para el cliente en vez de parecer un 200 válido.
+    """
+
+    def __init__(self, wfile):
+        self.wfile = wfile
+        self.closed = False
+
+    def write(self, data):
+        data = bytes(data)
+        if data:
+            self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        return len(data)
+
+    def flush(self):
+        self.wfile.flush()
+
+    def close(self):
+        self.closed = True
+
+    def finish(self):
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+class RimHandler(BaseHTTPRequestHandler):
+    server_version = "RimShelflifeAPI/1.0"
+    # HTTP/1.1 para poder usar chunked; cada respuesta cierra la conexión
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/health":
+            self._send_json(200, {"status": "ok", "rows": self.server.total_rows})
+        elif url.path == "/rows":
+            self._send_rows(parse_qs(url.query))
+        else:
+            self._send_json(404, {"error": f"ruta no encontrada: {url.path}"})
+
+    def _send_rows(self, query):
+        fmt = query.get("format", ["arrow"])[0].lower()
+        if fmt not in CONTENT_TYPES:
+            self._send_json(400, {"error": f"format inválido: {fmt} (arrow | parquet | csv)"})
+            return
+        try:
+            sql, params, limit, offset = build_query(self.server.present_cols, query)
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+
+        # Un cursor por request: DuckDB permite consultas concurrentes sobre la misma base
+        cursor = self.server.con.cursor()
+        try:
+            reader = cursor.execute(sql, params).fetch_record_batch(BATCH_SIZE)
+            # Leer el primer batch antes del 200: los errores tempranos van como 500
+            try:
+                first_batch = reader.read_next_batch()
+            except StopIteration:
+                first_batch = None
+        except Exception as e:
+            cursor.close()
+            self.log_error("Error en la consulta: %s", e)
+            self._send_json(500, {"error": str(e)})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPES[fmt])
+        self.send_header("Content-Disposition", f'attachment; filename="rim_filtered_export.{fmt}"')
+        self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("Connection", "close")
+        self.send_header("X-Offset", str(offset))
+        self.send_header("X-Limit", str(limit))
+        self.end_headers()
+        self.close_connection = True
+
+        sink = _ChunkedSink(self.wfile)
+        writer_cls = {
+            "arrow": ipc.new_stream,
+            "parquet": lambda s, schema: pq.ParquetWriter(s, schema, compression="zstd"),
+            "csv": pacsv.CSVWriter,
+        }[fmt]
+        rows = 0
+        try:
+            with writer_cls(sink, reader.schema) as writer:
+                if first_batch is not None:
+                    writer.write_batch(first_batch)
+                    rows += first_batch.num_rows
+                for batch in reader:
+                    writer.write_batch(batch)
+                    rows += batch.num_rows
+            sink.finish()
+        except (BrokenPipeError, ConnectionResetError):
+            self.log_error("Cliente desconectado tras %d filas", rows)
+        except Exception as e:
+            # Sin chunk final: el cliente ve la respuesta como incompleta
+            self.log_error("Respuesta truncada tras %d filas: %s", rows, e)
+        finally:
+            cursor.close()
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        self.wfile.write(body)
+
+
+def make_server(host, port, parquet_path, license_csv=None):
+    server = ThreadingHTTPServer((host, port), RimHandler)
+    server.daemon_threads = True
+    server.con = open_connection(parquet_path, license_csv)
+    cols_df = server.con.execute(f"PRAGMA table_info('{VIEW_NAME}')").fetchdf()
+    server.present_cols = cols_df["name"].str.lower().tolist()
+    server.total_rows = server.con.execute(f"SELECT COUNT(*) FROM {VIEW_NAME}").fetchone()[0]
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API HTTP de solo lectura para RIM License Shelf Life")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--parquet", help="Ruta al Parquet (por defecto, la misma que report.py)")
+    parser.add_argument("--license-csv", help="CSV de licencias (por defecto, data/raw/rim_license_392.csv)")
+    args = parser.parse_args()
+
+    parquet_path = Path(args.parquet) if args.parquet else find_parquet()
+    if not parquet_path or not parquet_path.exists():
+        print("❌ No se encontró el Parquet procesado.")
+        print(f"   Buscado en: {PARQUET_DIR_CANDIDATES[0]}")
+        print("   Ejecuta primero duckdb_rim.py o indica --parquet.")
+        sys.exit(1)
+    license_csv = Path(args.license_csv) if args.license_csv else find_license_csv()
+
+    server = make_server(args.host, args.port, parquet_path, license_csv)
+    print(f"🚀 API escuchando en http://{args.host}:{args.port}")
+    print(f"   Parquet: {parquet_path}")
+    print(f"   Licencias: {license_csv or '(sin CSV)'}")
+    print(f"   Filas disponibles: {server.total_rows:,}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n✅ Servidor detenido.")
+    finally:
+        server.server_close()
+        server.con.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@ import duckdb
 from pathlib import Path
 import sys
 
+from rim_schema import duckdb_invalid_counts, duckdb_select
+
 # Detecta la carpeta de salida correcta (preferir data/processed fuera de src)
 BASE_DIR = Path(__file__).resolve().parents[1]
 DEFAULT_DIR = BASE_DIR / "data" / "processed" / "rim_license_product_filtered"
@@ -47,25 +49,32 @@ COLUMNS = [
     "localproductcode",
     "approvedshelflife",
 ]
-cols_str = ",".join(COLUMNS)
+# Tipado compacto (BIGINT/INTEGER) también para Parquet antiguos o CSV
+cols_str = duckdb_select(COLUMNS)
 
 # 1️⃣ Crear vista a partir del formato disponible
 if has_parquet:
     con.execute(f"""
-    CREATE OR REPLACE VIEW rim_filtered AS
-    SELECT {cols_str}
+    CREATE OR REPLACE VIEW rim_raw AS
+    SELECT {",".join(COLUMNS)}
     FROM read_parquet('{PARQUET_GLOB}');
     """)
 else:
     con.execute(f"""
-    CREATE OR REPLACE VIEW rim_filtered AS
-    SELECT {cols_str}
+    CREATE OR REPLACE VIEW rim_raw AS
+    SELECT {",".join(COLUMNS)}
     FROM read_csv_auto(
         '{CSV_GLOB}',
         SAMPLE_SIZE=-1,
         ignore_errors=true
     );
     """)
+con.execute(f"CREATE OR REPLACE VIEW rim_filtered AS SELECT {cols_str} FROM rim_raw;")
+
+# Valores no enteros o fuera de rango quedan como NULL (misma regla que los extractores)
+for col, n in duckdb_invalid_counts(con, "rim_raw", COLUMNS).items():
+    if n:
+        print(f"⚠️ {col}: {n:,} valores no enteros o fuera de rango → NULL")
 
 # 2️⃣ Conteo rápido
 total_rows = con.execute("SELECT COUNT(*) FROM rim_filtered;").fetchone()[0]
@@ -3,6 +3,8 @@ import pandas as pd
 import os
 import time
 
+from rim_schema import typed_frame
+
 # ✅ 1. Connection details (mismas credenciales que odbc_match.py)
 dsn = "DenodoODBCTerraProd"
 database = "terra"
@@ -33,7 +35,8 @@ try:
     """
 
     print("📥 Ejecutando consulta (sin particionar)...")
-    df = pd.read_sql(sql_query, conn)
+    # licenseid llega como float/object desde el ODBC: tipar a Int64 antes de guardar
+    df = typed_frame(pd.read_sql(sql_query, conn))
     print(f"📊 Filas extraídas: {len(df):,}")
     print(f"📊 Columnas: {len(df.columns):,}")
 
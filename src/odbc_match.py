@@ -6,6 +6,10 @@ import os
 import datetime
 import time
 
+import pyarrow.parquet as pq
+
+from rim_schema import typed_table
+
 # ✅ 1. Connection details
 dsn = "DenodoODBCTerraProd"
 database = "terra"
@@ -88,22 +92,16 @@ try:
             break
 
         total_rows += num_rows
-        # Intentar guardar como Parquet; fallback a CSV si no está pyarrow
-        try:
-            import pyarrow  # noqa: F401
-            output_file = os.path.join(output_dir, f"{table_name}_{part:05d}.parquet")
-            df.to_parquet(output_file, index=False)
-            saved_fmt = "parquet"
-        except Exception:
-            output_file = os.path.join(output_dir, f"{table_name}_{part:05d}.csv")
-            df.to_csv(output_file, index=False)
-            saved_fmt = "csv"
+        # Guardar como Parquet con esquema compacto (enteros nullable + dictionary).
+        # Sin fallback a CSV: duckdb_rim.py ignora los CSV si hay Parquet y se perderían filas.
+        output_file = os.path.join(output_dir, f"{table_name}_{part:05d}.parquet")
+        pq.write_table(typed_table(df), output_file, compression="zstd")
 
         # Log de progreso
         first_id_val = df[id_column].iloc[0]
         last_id_val = df[id_column].iloc[-1]
         print(
-            f"   ✅ Chunk {part:05d}: {num_rows:,} filas | {id_column}: {first_id_val} → {last_id_val} | Archivo: {output_file} ({saved_fmt})"
+            f"   ✅ Chunk {part:05d}: {num_rows:,} filas | {id_column}: {first_id_val} → {last_id_val} | Archivo: {output_file}"
         )
 
         part += 1
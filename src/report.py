@@ -5,6 +5,8 @@ import streamlit as st
 from io import BytesIO
 from pathlib import Path
 
+from rim_views import build_where, create_views
+
 
 # ========================
 # Sidebar: Data Source
@@ -91,37 +93,9 @@ try:
     if not path or not Path(path).exists():
         st.error("Parquet file not found. Please check the file location.")
         st.stop()
-    # Crea vista base desde Parquet
-    escaped_path = path.replace("'", "''")
-    con.execute(f"CREATE OR REPLACE VIEW {base_view_name} AS SELECT * FROM read_parquet('{escaped_path}')")
-
-    # Enriquecer con licensenumber si el CSV existe
-    if LICENSE_CSV_PATH and LICENSE_CSV_PATH.exists():
-        lic_path_esc = str(LICENSE_CSV_PATH).replace("'", "''")
-        # Normalizar y TRIM para join robusto
-        con.execute(
-            f"""
-            CREATE OR REPLACE VIEW license_map AS
-            SELECT TRIM(CAST(licenseid AS VARCHAR)) AS licenseid,
-                   TRIM(CAST(licensenumber AS VARCHAR)) AS licensenumber
-            FROM read_csv_auto('{lic_path_esc}', SAMPLE_SIZE=-1, ignore_errors=true, header=true, normalize_names=true)
-            """
-        )
-        # Info del CSV cargado
-       
-
-        con.execute(
-            f"""
-            CREATE OR REPLACE VIEW {view_name} AS
-            SELECT r.*, lm.licensenumber
-            FROM {base_view_name} r
-            LEFT JOIN license_map lm
-              ON TRIM(CAST(CAST(r.licenseid AS INTEGER) AS VARCHAR)) = lm.licenseid
-            """
-        )
-    else:
-        # Si no existe el CSV, usar la vista base tal cual
-        con.execute(f"CREATE OR REPLACE VIEW {view_name} AS SELECT * FROM {base_view_name}")
+    # Crea vista base desde Parquet y enriquece con licensenumber si el CSV existe
+    license_csv = LICENSE_CSV_PATH if LICENSE_CSV_PATH and LICENSE_CSV_PATH.exists() else None
+    create_views(con, path, license_csv, base_view_name=base_view_name, view_name=view_name)
 
 except Exception as e:
     st.exception(e)
@@ -167,22 +141,10 @@ with st.sidebar:
 # ========================
 # Build WHERE clause dynamically
 # ========================
-where = []
-params = []
-
-if licensenumber_filter.strip() and "licensenumber" in present_cols:
-    where.append("lower(licensenumber) LIKE lower(?)")
-    params.append(f"%{licensenumber_filter}%")
-
-if lpc_like.strip() and "localproductcode" in present_cols:
-    where.append("lower(localproductcode) LIKE lower(?)")
-    params.append(f"%{lpc_like}%")
-
-if asl_like.strip() and "approvedshelflife" in present_cols:
-    where.append("CAST(approvedshelflife AS VARCHAR) LIKE ?")
-    params.append(f"%{asl_like}%")
-
-where_sql = (" WHERE " + " AND ".join(where)) if where else ""
+where_sql, params = build_where(
+    present_cols,
+    {"license": licensenumber_filter, "product": lpc_like, "shelflife": asl_like},
+)
 
 # ========================
 # KPIs
@@ -228,10 +190,8 @@ cols_to_show = ["licensenumber", "licenseid", "localproductcode", "approvedshelf
 available_cols = [c for c in cols_to_show if c in preview_df.columns]
 preview_df = preview_df[available_cols]
 
-# Convertir columnas a enteros (si existen) y configurar visualización sin separador de miles
+# Enteros ya tipados desde la extracción; visualización sin separador de miles
 int_cols = [c for c in ["licenseid", "approvedshelflife"] if c in preview_df.columns]
-for c in int_cols:
-    preview_df[c] = pd.to_numeric(preview_df[c], errors="coerce").astype("Int64")
 
 # Si hay licensenumber, ocultar licenseid
 if "licensenumber" in preview_df.columns and "licenseid" in preview_df.columns:
@@ -264,11 +224,6 @@ cols_to_export = ["licensenumber", "licenseid", "localproductcode", "approvedshe
 available_export_cols = [c for c in cols_to_export if c in export_df.columns]
 export_df = export_df[available_export_cols]
 
-# Asegurar enteros en exportación
-int_cols_export = [c for c in ["licenseid", "approvedshelflife"] if c in export_df.columns]
-for c in int_cols_export:
-    export_df[c] = pd.to_numeric(export_df[c], errors="coerce").astype("Int64")
-
 # Si hay licensenumber, ocultar licenseid en export
 if "licensenumber" in export_df.columns and "licenseid" in export_df.columns:
     export_df = export_df.drop(columns=["licenseid"])
@@ -0,0 +1,142 @@
+# rim_schema.py
+#
+# Esquema Arrow compacto compartido por los extractores.
+# pd.read_sql devuelve las claves como float/object (por los NULL del ODBC),
+# así que tipamos una sola vez al escribir y el reporte ya no necesita CASTs.
+
+from decimal import Decimal, InvalidOperation
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+# ✅ Claves y shelf life: enteros con nulos
+INT_COLUMNS = {
+    "licenseproductid": pa.int64(),
+    "licenseid": pa.int64(),
+    "refproductid": pa.int64(),
+    "approvedshelflife": pa.int32(),
+}
+
+# ✅ Strings de baja cardinalidad: dictionary-encoded
+DICT_COLUMNS = ["countryid", "localproductcode"]
+
+# Equivalentes en DuckDB (para vistas CSV/Parquet sin tipar)
+DUCKDB_TYPES = {
+    "licenseproductid": "BIGINT",
+    "licenseid": "BIGINT",
+    "refproductid": "BIGINT",
+    "approvedshelflife": "INTEGER",
+    "countryid": "VARCHAR",
+    "localproductcode": "VARCHAR",
+}
+
+
+# Regla común a ambos caminos (pandas y DuckDB): un valor no numérico, con
+# decimales o fuera de rango se convierte en NULL (nunca se redondea) y se
+# informa el conteo por columna.
+
+
+def _parse_int(value):
+    """Entero exacto o None si el valor no es numérico o tiene decimales."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    try:
+        number = Decimal(str(value).strip())
+    except InvalidOperation:
+        return None
+    if not number.is_finite() or number != number.to_integral_value():
+        return None
+    return int(number)
+
+
+def _coerce_int(series, name):
+    """Convierte a entero nullable (Int32/Int64) aplicando la regla de NULL."""
+    dtype = "Int32" if INT_COLUMNS[name] == pa.int32() else "Int64"
+    info = np.iinfo(dtype.lower())
+    if pd.api.types.is_integer_dtype(series) or pd.api.types.is_float_dtype(series):
+        values = series.astype("float64") if pd.api.types.is_float_dtype(series) else series
+        # Cota superior estricta: float(2**63 - 1) redondea a 2**63, fuera de int64
+        valid = (values == np.floor(values)) & (values >= info.min) & (values < float(info.max) + 1)
+        result = values.where(valid).astype(dtype)
+    else:
+        # Strings/object: parseo exacto (pasar por float perdería precisión en IDs grandes)
+        parsed = [_parse_int(v) for v in series]
+        ok = [v is not None and info.min <= v <= info.max for v in parsed]
+        valid = pd.Series(ok, index=series.index)
+        result = pd.Series(pd.array([v if k else None for v, k in zip(parsed, ok)], dtype=dtype), index=series.index)
+    invalid = series.notna() & ~valid
+    if invalid.any():
+        example = series[invalid].iloc[0]
+        print(f"   ⚠️ {name}: {int(invalid.sum()):,} valores no enteros o fuera de rango → NULL (ej. {example!r})")
+    return result
+
+
+def _to_dict(series):
+    """Normaliza a string (sin '392.0') y aplica dictionary encoding."""
+    if pd.api.types.is_float_dtype(series):
+        series = series.map(
+            lambda v: None if pd.isna(v) else (str(int(v)) if float(v).is_integer() else str(v))
+        )
+    values = series.astype("string").str.strip()
+    return pa.array(values, type=pa.string(), from_pandas=True).dictionary_encode()
+
+
+def typed_table(df):
+    """Devuelve un pa.Table con el esquema compacto aplicado.
+
+    Solo se tipan las columnas conocidas; el resto se deja como lo infiere pyarrow.
+    """
+    columns = {}
+    for col in df.columns:
+        if col in INT_COLUMNS:
+            columns[col] = pa.array(_coerce_int(df[col], col), type=INT_COLUMNS[col], from_pandas=True)
+        elif col in DICT_COLUMNS:
+            columns[col] = _to_dict(df[col])
+        else:
+            columns[col] = pa.array(df[col], from_pandas=True)
+    return pa.table(columns)
+
+
+def typed_frame(df):
+    """Versión pandas: Int32/Int64 nullable y category para los strings."""
+    df = df.copy()
+    for col in INT_COLUMNS:
+        if col in df.columns:
+            df[col] = _coerce_int(df[col], col)
+    for col in DICT_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.Series(_to_dict(df[col]).to_pandas(), index=df.index)
+    return df
+
+
+def _duckdb_expr(col):
+    """Expresión DuckDB con la misma regla que _coerce_int (TRY_CAST solo redondearía)."""
+    sql_type = DUCKDB_TYPES[col]
+    if col not in INT_COLUMNS:
+        return f"TRY_CAST({col} AS {sql_type})"
+    dec = f"TRY_CAST({col} AS DECIMAL(38,10))"
+    return f"CASE WHEN {dec} = trunc({dec}) THEN TRY_CAST({dec} AS {sql_type}) END"
+
+
+def duckdb_select(columns):
+    """Lista SELECT con el tipo compacto para las columnas conocidas."""
+    parts = []
+    for col in columns:
+        if col in DUCKDB_TYPES:
+            parts.append(f"{_duckdb_expr(col)} AS {col}")
+        else:
+            parts.append(col)
+    return ",".join(parts)
+
+
+def duckdb_invalid_counts(con, source, columns):
+    """Cuenta, por columna entera, los valores no nulos que la regla convierte en NULL."""
+    int_cols = [c for c in columns if c in INT_COLUMNS]
+    if not int_cols:
+        return {}
+    counts = ",".join(
+        f"COUNT(*) FILTER (WHERE {c} IS NOT NULL AND ({_duckdb_expr(c)}) IS NULL)" for c in int_cols
+    )
+    row = con.execute(f"SELECT {counts} FROM {source}").fetchone()
+    return dict(zip(int_cols, row))
@@ -0,0 +1,64 @@
+# rim_views.py
+#
+# Vistas DuckDB y filtros compartidos por report.py y api.py, para que el
+# reporte y la API devuelvan exactamente las mismas filas.
+
+# Filtro -> (columna requerida, condición SQL)
+FILTERS = {
+    "license": ("licensenumber", "lower(licensenumber) LIKE lower(?)"),
+    "product": ("localproductcode", "lower(localproductcode) LIKE lower(?)"),
+    "shelflife": ("approvedshelflife", "CAST(approvedshelflife AS VARCHAR) LIKE ?"),
+}
+
+
+def create_views(con, parquet_path, license_csv=None, base_view_name="rim_base", view_name="rim"):
+    """Crea la vista base desde Parquet y la enriquece con licensenumber si hay CSV."""
+    escaped_path = str(parquet_path).replace("'", "''")
+    con.execute(f"CREATE OR REPLACE VIEW {base_view_name} AS SELECT * FROM read_parquet('{escaped_path}')")
+
+    if license_csv:
+        lic_path_esc = str(license_csv).replace("'", "''")
+        # licenseid tipado como entero (igual que en el Parquet) para un join directo
+        con.execute(
+            f"""
+            CREATE OR REPLACE VIEW license_map AS
+            SELECT TRY_CAST(licenseid AS BIGINT) AS licenseid,
+                   TRIM(CAST(licensenumber AS VARCHAR)) AS licensenumber
+            FROM read_csv_auto('{lic_path_esc}', SAMPLE_SIZE=-1, ignore_errors=true, header=true, normalize_names=true)
+            """
+        )
+        con.execute(
+            f"""
+            CREATE OR REPLACE VIEW {view_name} AS
+            SELECT r.*, lm.licensenumber
+            FROM {base_view_name} r
+            LEFT JOIN license_map lm
+              ON r.licenseid = lm.licenseid
+            """
+        )
+    else:
+        # Si no existe el CSV, usar la vista base tal cual
+        con.execute(f"CREATE OR REPLACE VIEW {view_name} AS SELECT * FROM {base_view_name}")
+
+
+def build_where(present_cols, values, strict=False):
+    """Construye el WHERE (" WHERE ..." o "") y sus parámetros.
+
+    `values` mapea nombre de filtro (ver FILTERS) -> texto "contiene…".
+    Con strict=True, un filtro sobre una columna ausente lanza ValueError
+    en vez de ignorarse.
+    """
+    where = []
+    params = []
+    for name, text in values.items():
+        if not text or not text.strip():
+            continue
+        column, condition = FILTERS[name]
+        if column not in present_cols:
+            if strict:
+                raise ValueError(f"filtro '{name}' no disponible: falta la columna {column}")
+            continue
+        where.append(condition)
+        params.append(f"%{text}%")
+    where_sql = (" WHERE " + " AND ".join(where)) if where else ""
+    return where_sql, params